@@ -18,6 +18,8 @@ Requirements: pip install matplotlib pandas numpy; winget install ffmpeg
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")                  # file output only — no GUI backend needed
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from pathlib import Path
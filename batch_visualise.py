@@ -10,6 +10,8 @@ Requirements:  pip install matplotlib pandas numpy
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")                  # file output only — no GUI backend needed
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from pathlib import Path
@@ -66,13 +68,14 @@ def render_graph(graph_dir: Path):
         sp.set_visible(False)
 
     # ── Draw edges (batched) ──────────────────────────────────
-    pos = nodes.set_index("node_id")[["x", "y"]]
+    pos = dict(zip(nodes["node_id"].tolist(),
+                   zip(nodes["x"].tolist(), nodes["y"].tolist())))
     xs, ys = [], []
-    for _, e in edges.iterrows():
-        s, t = int(e["source"]), int(e["target"])
-        if s in pos.index and t in pos.index:
-            xs += [pos.at[s, "x"], pos.at[t, "x"], None]
-            ys += [pos.at[s, "y"], pos.at[t, "y"], None]
+    for s, t in zip(edges["source"].tolist(), edges["target"].tolist()):
+        if s in pos and t in pos:
+            (ux, uy), (vx, vy) = pos[s], pos[t]
+            xs += [ux, vx, None]
+            ys += [uy, vy, None]
 
     if xs:
         ax.plot(xs, ys,
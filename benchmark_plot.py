@@ -9,11 +9,11 @@ Reads output/benchmark.csv and produces two publication-ready figures:
 Run after fr_benchmark has produced output/benchmark.csv.
 """
 
-import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")                  # file output only — no GUI backend needed
 import matplotlib.pyplot as plt
 from pathlib import Path
-from scipy.optimize import curve_fit
 
 INPUT_FILE = Path("output/benchmark.csv")
 OUTPUT_DIR = Path("figures")
@@ -29,6 +29,8 @@ plt.rcParams.update({
     "figure.dpi"     : 150,
     "savefig.dpi"    : 300,
     "savefig.bbox"   : "tight",
+    "pdf.fonttype"   : 42,
+    "pdf.compression": 6,
 })
 
 COLOUR_BF  = "#e53e3e"   # red  – BruteForce
@@ -45,24 +47,34 @@ def nlogn(N, a):
     """O(N log N) model:  t = a·N·log(N)"""
     return a * N * np.log(N)
 
+def fit_scale(x: np.ndarray, t: np.ndarray) -> float:
+    """Least-squares a for the one-parameter model t = a·x:  a = Σ(t·x) / Σ(x²)"""
+    return (t * x).sum() / (x * x).sum()
+
 # ── Load data ─────────────────────────────────────────────────────────────────
 
-def load_benchmark() -> pd.DataFrame:
-    df = pd.read_csv(INPUT_FILE)
-    print(f"Loaded {len(df)} benchmark points from {INPUT_FILE}\n")
-    print(df.to_string(index=False))
+def load_benchmark() -> np.ndarray:
+    # A handful of rows — a structured NumPy array avoids the pandas import
+    data = np.atleast_1d(np.genfromtxt(INPUT_FILE, delimiter=",", names=True))
+    print(f"Loaded {len(data)} benchmark points from {INPUT_FILE}\n")
+    print(f"  {'N':>6}  {'BruteForce_ms':>14}  {'BarnesHut_ms':>14}")
+    for row in data:
+        print(f"  {int(row['N']):>6}  "
+              f"{row['BruteForce_ms']:>14.2f}  "
+              f"{row['BarnesHut_ms']:>14.2f}")
     print()
-    return df
+    return data
 
 # ── Figure 5: Linear scale ────────────────────────────────────────────────────
 
-def plot_linear(df: pd.DataFrame):
-    fig, ax = plt.subplots(figsize=(8, 5))
+def plot_linear(data: np.ndarray):
+    fig = plt.figure("complexity_linear", figsize=(8, 5), clear=True)
+    ax  = fig.add_subplot(1, 1, 1)
 
-    ax.plot(df["N"], df["BruteForce_ms"], "o-",
+    ax.plot(data["N"], data["BruteForce_ms"], "o-",
             color=COLOUR_BF, linewidth=1.8, markersize=5,
             label=r"Brute Force $O(|V|^2)$")
-    ax.plot(df["N"], df["BarnesHut_ms"], "s-",
+    ax.plot(data["N"], data["BarnesHut_ms"], "s-",
             color=COLOUR_BH, linewidth=1.8, markersize=5,
             label=r"Barnes-Hut $O(|V|\log|V|)$")
 
@@ -75,24 +87,24 @@ def plot_linear(df: pd.DataFrame):
     fig.tight_layout()
     fig.savefig(OUTPUT_DIR / "05_complexity_linear.pdf")
     print("  ✓  figures/05_complexity_linear.pdf")
-    plt.close(fig)
 
 # ── Figure 6: Log-log with fitted curves ─────────────────────────────────────
 
-def plot_loglog(df: pd.DataFrame):
-    N  = df["N"].to_numpy(dtype=float)
-    bf = df["BruteForce_ms"].to_numpy(dtype=float)
-    bh = df["BarnesHut_ms"].to_numpy(dtype=float)
+def plot_loglog(data: np.ndarray):
+    N  = data["N"]
+    bf = data["BruteForce_ms"]
+    bh = data["BarnesHut_ms"]
 
     # Fit theoretical models to measured data
-    (a_bf,), _ = curve_fit(quadratic, N, bf)
-    (a_bh,), _ = curve_fit(nlogn,    N, bh)
+    a_bf = fit_scale(quadratic(N, 1.0), bf)
+    a_bh = fit_scale(nlogn(N, 1.0),     bh)
 
     N_fit  = np.linspace(N.min(), N.max(), 300)
     bf_fit = quadratic(N_fit, a_bf)
     bh_fit = nlogn(N_fit, a_bh)
 
-    fig, ax = plt.subplots(figsize=(8, 5))
+    fig = plt.figure("complexity_loglog", figsize=(8, 5), clear=True)
+    ax  = fig.add_subplot(1, 1, 1)
 
     # Raw measurements
     ax.loglog(N, bf, "o", color=COLOUR_BF, markersize=6, label="Brute Force (measured)")
@@ -113,15 +125,14 @@ def plot_loglog(df: pd.DataFrame):
     fig.tight_layout()
     fig.savefig(OUTPUT_DIR / "06_complexity_loglog.pdf")
     print("  ✓  figures/06_complexity_loglog.pdf")
-    plt.close(fig)
 
 # ── Console summary ───────────────────────────────────────────────────────────
 
-def print_speedup_table(df: pd.DataFrame):
+def print_speedup_table(data: np.ndarray):
     print("Speedup table (BruteForce / BarnesHut):")
     print(f"  {'N':>6}  {'BF (ms)':>12}  {'BH (ms)':>12}  {'Speedup':>10}")
     print("  " + "-" * 46)
-    for _, row in df.iterrows():
+    for row in data:
         speedup = row["BruteForce_ms"] / row["BarnesHut_ms"]
         print(f"  {int(row['N']):>6}  "
               f"{row['BruteForce_ms']:>12.2f}  "
@@ -132,11 +143,11 @@ def print_speedup_table(df: pd.DataFrame):
 
 def main():
     OUTPUT_DIR.mkdir(exist_ok=True)
-    df = load_benchmark()
-    print_speedup_table(df)
+    data = load_benchmark()
+    print_speedup_table(data)
     print("\nGenerating figures ...")
-    plot_linear(df)
-    plot_loglog(df)
+    plot_linear(data)
+    plot_loglog(data)
 
 if __name__ == "__main__":
     main()
@@ -12,6 +12,8 @@ Requirements: pip install matplotlib pandas numpy
 
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")                  # file output only — no GUI backend needed
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import matplotlib.colors as mcolors
@@ -110,13 +112,14 @@ for _, row in qt_sorted.iterrows():
 
 # ── Draw edges ────────────────────────────────────────────────────────────────
 
-node_pos = nodes.set_index("node_id")[["x", "y"]]
+node_pos = dict(zip(nodes["node_id"].tolist(),
+                    zip(nodes["x"].tolist(), nodes["y"].tolist())))
 xs, ys = [], []
-for _, e in edges.iterrows():
-    s, t = int(e["source"]), int(e["target"])
-    if s in node_pos.index and t in node_pos.index:
-        xs += [node_pos.at[s, "x"], node_pos.at[t, "x"], None]
-        ys += [node_pos.at[s, "y"], node_pos.at[t, "y"], None]
+for s, t in zip(edges["source"].tolist(), edges["target"].tolist()):
+    if s in node_pos and t in node_pos:
+        (ux, uy), (vx, vy) = node_pos[s], node_pos[t]
+        xs += [ux, vx, None]
+        ys += [uy, vy, None]
 
 if xs:
     ax.plot(xs, ys, color=EDGE_COLOUR, lw=EDGE_WIDTH,
@@ -1,5 +1,8 @@
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")                  # file output only — no GUI backend needed
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 
 # Convergence curve
 metrics = pd.read_csv("output/metrics.csv")
@@ -15,10 +18,15 @@ plt.savefig("convergence.pdf")
 nodes = pd.read_csv("output/nodes.csv")
 edges = pd.read_csv("output/edges.csv")
 
+# Join endpoint coordinates onto each edge: (xu, yu) -> (xv, yv)
+e2 = (edges
+      .merge(nodes.rename(columns={"node_id": "source", "x": "xu", "y": "yu"}),
+             on="source")
+      .merge(nodes.rename(columns={"node_id": "target", "x": "xv", "y": "yv"}),
+             on="target"))
+segments = e2[["xu", "yu", "xv", "yv"]].to_numpy().reshape(-1, 2, 2)
+
 fig, ax = plt.subplots(figsize=(10, 6))
-for _, e in edges.iterrows():
-    u = nodes[nodes.node_id == e.source].iloc[0]
-    v = nodes[nodes.node_id == e.target].iloc[0]
-    ax.plot([u.x, v.x], [u.y, v.y], "b-", lw=0.6, alpha=0.5)
+ax.add_collection(LineCollection(segments, colors="b", linewidths=0.6, alpha=0.5))
 ax.scatter(nodes.x, nodes.y, s=40, zorder=3)
 plt.savefig("layout.pdf")
\ No newline at end of file
@@ -4,19 +4,33 @@ visualise.py
 Thesis figures for the Fruchterman-Reingold force-directed layout algorithm.
 
 Produces:
-  figures/01_convergence.pdf   – kinetic energy vs iteration (log scale)
+  figures/01_convergence.pdf   – log10 kinetic energy vs iteration
   figures/02_layout.pdf        – final graph layout
   figures/03_temperature.pdf   – simulated annealing cooling curve
   figures/04_degree_dist.pdf   – degree distribution of the random graph
 
+Usage:
+  python visualise.py                 # vector PDFs (thesis default)
+  python visualise.py --format png    # raster PNGs at PNG_DPI, for huge graphs
+
 Requirements:
   pip install matplotlib pandas numpy
+  pip install pyarrow            (optional — enables the .parquet read cache)
+  pip install numba              (optional — JIT edge kernels for huge graphs)
 """
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")                  # file output only; safe in worker processes
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.collections import LineCollection
+from functools import lru_cache
 from pathlib import Path
 
 # ── Configuration ─────────────────────────────────────────────────────────────
@@ -29,6 +43,17 @@ COOLING_RATE = 0.95
 INIT_TEMP    = 200.0
 MAX_ITER     = 500
 
+# Resolution used when figures are written with --format png
+PNG_DPI = 200
+
+# Edge counts above this use the numba kernels (if installed); below it the
+# JIT start-up cost outweighs the gain over plain NumPy
+JIT_EDGES_ABOVE = 1_000_000
+
+# Long runs are thinned to about this many points on the convergence curve —
+# more vertices than the PDF can resolve only slow down savefig
+MAX_PLOT_POINTS = 2000
+
 # ── Style ─────────────────────────────────────────────────────────────────────
 
 plt.rcParams.update({
@@ -40,6 +65,8 @@ plt.rcParams.update({
     "figure.dpi"       : 150,
     "savefig.dpi"      : 300,
     "savefig.bbox"     : "tight",
+    "pdf.fonttype"     : 42,
+    "pdf.compression"  : 6,
     "text.usetex"      : False,   # set True if LaTeX is installed
 })
 
@@ -50,51 +77,174 @@ COLOUR_ANNEAL  = "#d69e2e"
 
 # ── Load data ─────────────────────────────────────────────────────────────────
 
+def read_csv_cached(csv: Path, dtype: dict | None = None) -> pd.DataFrame:
+    """
+    Reads a CSV through a sibling .parquet cache that is rebuilt whenever the
+    CSV is newer. Falls back to plain read_csv if no parquet engine (pyarrow)
+    is installed. Passing explicit dtypes skips read_csv's type inference.
+
+    The cache is written to a per-process temp file and moved into place with
+    os.replace, so an interrupted or concurrent write never leaves a truncated
+    .parquet behind; an unreadable cache is ignored and rebuilt from the CSV.
+    """
+    pq = csv.with_suffix(".parquet")
+    if pq.exists() and pq.stat().st_mtime >= csv.stat().st_mtime:
+        try:
+            return pd.read_parquet(pq)
+        except Exception:
+            pass
+    df  = pd.read_csv(csv, dtype=dtype)
+    tmp = pq.with_name(f"{pq.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, pq)
+    except (ImportError, OSError):
+        tmp.unlink(missing_ok=True)
+    return df
+
+# Column types match what the C++ exporter writes (ids + float positions)
+INPUT_DTYPES = {
+    "nodes"  : {"node_id": "int32", "x": "float32", "y": "float32"},
+    "edges"  : {"source": "int32", "target": "int32"},
+    "metrics": {"iteration": "int32", "kinetic_energy": "float32"},
+}
+
+def load_input(name: str) -> pd.DataFrame:
+    return read_csv_cached(INPUT_DIR / f"{name}.csv", INPUT_DTYPES[name])
+
 def load_data():
-    nodes   = pd.read_csv(INPUT_DIR / "nodes.csv")
-    edges   = pd.read_csv(INPUT_DIR / "edges.csv")
-    metrics = pd.read_csv(INPUT_DIR / "metrics.csv")
-    return nodes, edges, metrics
+    return load_input("nodes"), load_input("edges"), load_input("metrics")
+
+# ── Edge kernels ──────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def numba_kernels():
+    """
+    Imports numba and defines the JIT kernels on first use, so runs below
+    JIT_EDGES_ABOVE (and every worker process) never pay numba's import cost.
+    Returns (segments_kernel, degree_kernel), or None if numba is missing.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:                # optional — NumPy fallback is used
+        return None
+
+    @njit(parallel=True, cache=True)
+    def edge_segments_jit(src, tgt, pos):
+        segments = np.empty((src.size, 2, 2))
+        for i in prange(src.size):
+            s = src[i]
+            t = tgt[i]
+            segments[i, 0, 0] = pos[s, 0]
+            segments[i, 0, 1] = pos[s, 1]
+            segments[i, 1, 0] = pos[t, 0]
+            segments[i, 1, 1] = pos[t, 1]
+        return segments
+
+    # Serial: parallel increments of a shared degree array would race
+    @njit(cache=True)
+    def degree_jit(src, tgt, n):
+        degree = np.zeros(n, np.int64)
+        for i in range(src.size):
+            degree[src[i]] += 1
+            degree[tgt[i]] += 1
+        return degree
+
+    return edge_segments_jit, degree_jit
+
+def edge_segments(src: np.ndarray, tgt: np.ndarray,
+                  pos: np.ndarray) -> np.ndarray:
+    """(|E|, 2, 2) array of endpoint coordinates for row indices src/tgt."""
+    if src.size > JIT_EDGES_ABOVE and (kernels := numba_kernels()):
+        return kernels[0](src, tgt, pos)
+    segments = np.empty((src.size, 2, 2))
+    segments[:, 0, :] = pos[src]
+    segments[:, 1, :] = pos[tgt]
+    return segments
+
+def vertex_degree(src: np.ndarray, tgt: np.ndarray, n: int) -> np.ndarray:
+    """
+    Degree of every id in [0, n), grown to cover the largest endpoint id so
+    the JIT kernel (which has no bounds checks) never writes out of range.
+    """
+    if min(src.min(initial=0), tgt.min(initial=0)) < 0:
+        raise ValueError("node ids must be non-negative")
+    n = max(n, src.max(initial=-1) + 1, tgt.max(initial=-1) + 1)
+    if src.size > JIT_EDGES_ABOVE and (kernels := numba_kernels()):
+        return kernels[1](src, tgt, n)
+    return (np.bincount(src, minlength=n) +
+            np.bincount(tgt, minlength=n))
+
+# ── Saving ────────────────────────────────────────────────────────────────────
+
+def save_figure(fig, stem: str, fmt: str = "pdf"):
+    """Writes figures/<stem>.<fmt>; PNGs use PNG_DPI instead of savefig.dpi."""
+    path = OUTPUT_DIR / f"{stem}.{fmt}"
+    if fmt == "png":
+        fig.savefig(path, dpi=PNG_DPI)
+    else:
+        fig.savefig(path)
+    print(f"  ✓  {path.as_posix()}")
 
 # ── Figure 1: Convergence curve ───────────────────────────────────────────────
 
-def plot_convergence(metrics: pd.DataFrame):
-    fig, ax = plt.subplots(figsize=(8, 4))
+def plot_convergence(metrics: pd.DataFrame, fmt: str = "pdf"):
+    fig = plt.figure("convergence", figsize=(8, 4), clear=True)
+    ax  = fig.add_subplot(1, 1, 1)
+
+    ke   = metrics["kinetic_energy"].to_numpy()
+    step = max(1, len(ke) // MAX_PLOT_POINTS)
 
-    ax.semilogy(metrics["iteration"], metrics["kinetic_energy"],
-                color=COLOUR_ACCENT, linewidth=1.5, label="Kinetic energy $E_k$")
+    # log10 taken once on a linear axis instead of a LogScale transform;
+    # non-positive energies are masked, as semilogy would do
+    ke_plot = ke[::step]
+    log_ke  = np.log10(np.where(ke_plot > 0, ke_plot, np.nan))
+    ax.plot(metrics["iteration"].to_numpy()[::step], log_ke,
+            color=COLOUR_ACCENT, linewidth=1.5, label="Kinetic energy $E_k$")
 
     # Mark the point where energy drops below 1% of its initial value
-    threshold = metrics["kinetic_energy"].iloc[0] * 0.01
-    crossed   = metrics[metrics["kinetic_energy"] < threshold]
-    if not crossed.empty:
-        conv_iter = crossed["iteration"].iloc[0]
+    # (searched on the full series, not the thinned one)
+    threshold = ke[0] * 0.01
+    idx       = np.argmax(ke < threshold)   # first True, or 0 if none
+    if ke[idx] < threshold:
+        conv_iter = int(metrics["iteration"].iloc[idx])
         ax.axvline(conv_iter, color="grey", linestyle="--", linewidth=1.0,
                    label=f"1 % threshold @ iter {conv_iter}")
 
     ax.set_xlabel("Iteration")
-    ax.set_ylabel("Kinetic Energy (log scale)")
+    ax.set_ylabel(r"$\log_{10}$ Kinetic Energy")
     ax.set_title("Fruchterman-Reingold — Convergence Curve")
     ax.legend()
     ax.grid(True, which="both", linestyle=":", linewidth=0.5, alpha=0.7)
 
     fig.tight_layout()
-    fig.savefig(OUTPUT_DIR / "01_convergence.pdf")
-    print("  ✓  figures/01_convergence.pdf")
-    plt.close(fig)
+    save_figure(fig, "01_convergence", fmt)
 
 # ── Figure 2: Graph layout ────────────────────────────────────────────────────
 
-def plot_layout(nodes: pd.DataFrame, edges: pd.DataFrame):
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    # Draw edges first (behind nodes)
-    node_pos = nodes.set_index("node_id")[["x", "y"]]
-    for _, e in edges.iterrows():
-        u = node_pos.loc[e["source"]]
-        v = node_pos.loc[e["target"]]
-        ax.plot([u.x, v.x], [u.y, v.y],
-                color=COLOUR_EDGE, linewidth=0.7, alpha=0.8, zorder=1)
+def plot_layout(nodes: pd.DataFrame, edges: pd.DataFrame, fmt: str = "pdf"):
+    fig = plt.figure("layout", figsize=(10, 6), clear=True)
+    ax  = fig.add_subplot(1, 1, 1)
+
+    # Draw edges first (behind nodes) — one collection instead of one
+    # Line2D artist per edge
+    pos = nodes[["x", "y"]].to_numpy()
+    ids = nodes["node_id"].to_numpy()
+    u   = edges["source"].to_numpy()
+    v   = edges["target"].to_numpy()
+    # node_id -> row in pos; -1 marks ids with no node
+    row = np.full(max(ids.max(), u.max(initial=0), v.max(initial=0)) + 1, -1,
+                  dtype=np.intp)
+    row[ids] = np.arange(len(ids))
+    src = row[u]
+    tgt = row[v]
+    # Skip edges with a missing endpoint, as batch_visualise/plot_quadtree do
+    keep = (src >= 0) & (tgt >= 0)
+    src, tgt = src[keep], tgt[keep]
+
+    segments = edge_segments(src, tgt, pos)
+    ax.add_collection(LineCollection(segments, colors=COLOUR_EDGE,
+                                     linewidths=0.7, alpha=0.8, zorder=1))
 
     # Draw nodes
     ax.scatter(nodes["x"], nodes["y"],
@@ -107,22 +257,22 @@ def plot_layout(nodes: pd.DataFrame, edges: pd.DataFrame):
     ax.set_aspect("equal")
     ax.grid(False)
     fig.tight_layout()
-    fig.savefig(OUTPUT_DIR / "02_layout.pdf")
-    print("  ✓  figures/02_layout.pdf")
-    plt.close(fig)
+    save_figure(fig, "02_layout", fmt)
 
 # ── Figure 3: Simulated annealing cooling curve ───────────────────────────────
 
-def plot_temperature():
+def plot_temperature(fmt: str = "pdf"):
     """
     Reconstructs the theoretical cooling schedule T(t) = T_0 * alpha^t
     and plots it — no CSV needed, derived analytically from Config values.
     """
     iters = np.arange(MAX_ITER)
-    T     = INIT_TEMP * (COOLING_RATE ** iters)
-    T     = np.maximum(T, 1e-3)            # T_min floor
+    # T_min floor applied in log space, then a single exp back to T
+    logT  = np.log(INIT_TEMP) + iters * np.log(COOLING_RATE)
+    T     = np.exp(np.maximum(logT, np.log(1e-3)))   # T_min floor
 
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig = plt.figure("temperature", figsize=(8, 4), clear=True)
+    ax  = fig.add_subplot(1, 1, 1)
 
     ax.plot(iters, T, color=COLOUR_ANNEAL, linewidth=1.5,
             label=rf"$T(t) = {INIT_TEMP:.0f} \times {COOLING_RATE}^{{t}}$")
@@ -134,23 +284,27 @@ def plot_temperature():
     ax.grid(True, linestyle=":", linewidth=0.5, alpha=0.7)
 
     fig.tight_layout()
-    fig.savefig(OUTPUT_DIR / "03_temperature.pdf")
-    print("  ✓  figures/03_temperature.pdf")
-    plt.close(fig)
+    save_figure(fig, "03_temperature", fmt)
 
 # ── Figure 4: Degree distribution ─────────────────────────────────────────────
 
-def plot_degree_distribution(nodes: pd.DataFrame, edges: pd.DataFrame):
-    # Compute degree for each node
-    degree = pd.concat([edges["source"], edges["target"]]) \
-               .value_counts() \
-               .reindex(nodes["node_id"], fill_value=0)
+def plot_degree_distribution(nodes: pd.DataFrame, edges: pd.DataFrame,
+                             fmt: str = "pdf"):
+    # Compute degree for each node — node ids are non-negative integers,
+    # so counting both endpoint columns is a single O(|E|) pass. The count
+    # also covers ids that only appear in edges; [ids] then keeps real nodes.
+    ids    = nodes["node_id"].to_numpy()
+    src    = edges["source"].to_numpy()
+    tgt    = edges["target"].to_numpy()
+    n      = max(ids.max(), src.max(initial=0), tgt.max(initial=0)) + 1
+    degree = vertex_degree(src, tgt, n)[ids]
 
-    counts = degree.value_counts().sort_index()
+    counts = np.bincount(degree)
 
-    fig, ax = plt.subplots(figsize=(7, 4))
+    fig = plt.figure("degree", figsize=(7, 4), clear=True)
+    ax  = fig.add_subplot(1, 1, 1)
 
-    ax.bar(counts.index, counts.values,
+    ax.bar(np.arange(len(counts)), counts,
            color=COLOUR_NODE, edgecolor="white", linewidth=0.5)
 
     mean_deg = degree.mean()
@@ -164,13 +318,34 @@ def plot_degree_distribution(nodes: pd.DataFrame, edges: pd.DataFrame):
     ax.grid(True, axis="y", linestyle=":", linewidth=0.5, alpha=0.7)
 
     fig.tight_layout()
-    fig.savefig(OUTPUT_DIR / "04_degree_dist.pdf")
-    print("  ✓  figures/04_degree_dist.pdf")
-    plt.close(fig)
+    save_figure(fig, "04_degree_dist", fmt)
 
 # ── Main ──────────────────────────────────────────────────────────────────────
 
+# Figure name -> (inputs it needs, plot function)
+FIGURES = {
+    "convergence": (("metrics",),       plot_convergence),
+    "layout"     : (("nodes", "edges"), plot_layout),
+    "temperature": ((),                 plot_temperature),
+    "degree"     : (("nodes", "edges"), plot_degree_distribution),
+}
+
+def render(name: str, fmt: str = "pdf"):
+    """
+    Worker entry point: loads only the inputs this figure needs (cheap via the
+    parquet cache, and avoids pickling DataFrames across processes) and draws
+    it. An unknown figure name raises KeyError.
+    """
+    inputs, plot = FIGURES[name]
+    plot(*(load_input(i) for i in inputs), fmt)
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the thesis figures.")
+    parser.add_argument("--format", choices=("pdf", "png"), default="pdf",
+                        help="output format (png is only smaller than the "
+                             "vector PDF for very large graphs)")
+    args = parser.parse_args()
+
     OUTPUT_DIR.mkdir(exist_ok=True)
 
     print("Loading CSV data ...")
@@ -178,11 +353,11 @@ def main():
     print(f"  |V| = {len(nodes)}   |E| = {len(edges)}   "
           f"iterations = {len(metrics)}\n")
 
+    # The four figures are independent, so render them in parallel
     print("Generating figures ...")
-    plot_convergence(metrics)
-    plot_layout(nodes, edges)
-    plot_temperature()
-    plot_degree_distribution(nodes, edges)
+    workers = min(len(FIGURES), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(render, FIGURES, [args.format] * len(FIGURES)))
 
     print(f"\nAll figures saved to '{OUTPUT_DIR}/'")
 